@@ -1,10 +1,11 @@
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from dotenv import load_dotenv
-import pytz
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Mapping, Optional
 from enum import Enum
-
-load_dotenv()
+from zoneinfo import ZoneInfo
 
 
 class DayOfWeek(Enum):
@@ -19,43 +20,50 @@ class DayOfWeek(Enum):
     DOMINGO = "Sunday"
 
 
-class Config:
+# Mapeamentos imutáveis entre nomes em português (minúsculos) e em inglês
+DAY_MAP: Mapping[str, str] = MappingProxyType(
+    {day.name.lower(): day.value for day in DayOfWeek}
+)
+DAY_MAP_INV: Mapping[str, str] = MappingProxyType(
+    {english: portuguese for portuguese, english in DAY_MAP.items()}
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
     """Configurações globais do sistema."""
 
-    NOTION_API_KEY: str = os.getenv("NOTION_API_KEY")
-    TASKS_DB_ID: str = os.getenv("NOTION_DB_TAREFAS_ID")
-    TOPICS_DB_ID: str = os.getenv("NOTION_DB_TOPICS_ID")
-    TIME_SLOTS_DB_ID: str = os.getenv("NOTION_DB_TIME_SLOTS_ID")
-    SCHEDULES_DB_ID: str = os.getenv("NOTION_DB_SCHEDULES_ID")
+    NOTION_API_KEY: Optional[str]
+    TASKS_DB_ID: Optional[str]
+    TOPICS_DB_ID: Optional[str]
+    TIME_SLOTS_DB_ID: Optional[str]
+    SCHEDULES_DB_ID: Optional[str]
 
-    LOCAL_TZ = pytz.timezone("America/Sao_Paulo")
+    LOCAL_TZ: ZoneInfo
     LOG_LEVEL: str = "DEBUG"
     LOG_TO_FILE: bool = True
     LOG_TO_CONSOLE: bool = True
-    LOG_FILE_MAX_SIZE_MB: int = 5
-    LOG_BACKUP_COUNT: int = 5
     USE_CACHE: bool = False
     CACHE_MAX_AGE_DAYS: int = 1
     SCHEDULE_CLEAR_DB: bool = True
-    SCHEDULE_BATCH_SIZE: int = 15
+    NOTION_MAX_CONCURRENT_REQUESTS: int = 3
+    NOTION_REQUESTS_PER_SECOND: float = 3.0
     MAX_PART_DURATION_HOURS: int = 2
     REST_DURATION_HOURS: int = 1
     DAYS_TO_SCHEDULE: int = 30
-    DAY_MAP: Dict[str, str] = {day.name.lower(): day.value for day in DayOfWeek}
 
-    @staticmethod
-    def validate_env_vars() -> None:
+    def validate_env_vars(self) -> None:
         """Valida variáveis de ambiente obrigatórias.
 
         Raises:
             ValueError: Se alguma variável obrigatória estiver ausente.
         """
         required_vars = {
-            "NOTION_API_KEY": Config.NOTION_API_KEY,
-            "NOTION_DB_TAREFAS_ID": Config.TASKS_DB_ID,
-            "NOTION_DB_TOPICS_ID": Config.TOPICS_DB_ID,
-            "NOTION_DB_TIME_SLOTS_ID": Config.TIME_SLOTS_DB_ID,
-            "NOTION_DB_SCHEDULES_ID": Config.SCHEDULES_DB_ID,
+            "NOTION_API_KEY": self.NOTION_API_KEY,
+            "NOTION_DB_TAREFAS_ID": self.TASKS_DB_ID,
+            "NOTION_DB_TOPICS_ID": self.TOPICS_DB_ID,
+            "NOTION_DB_TIME_SLOTS_ID": self.TIME_SLOTS_DB_ID,
+            "NOTION_DB_SCHEDULES_ID": self.SCHEDULES_DB_ID,
         }
         missing_vars = [name for name, value in required_vars.items() if not value]
         if missing_vars:
@@ -64,4 +72,44 @@ class Config:
             )
 
 
-Config.validate_env_vars()
+@lru_cache(maxsize=1)
+def get_config() -> Settings:
+    """Lê o ambiente e valida as configurações uma única vez por processo.
+
+    Returns:
+        Instância única e imutável de Settings.
+
+    Raises:
+        ValueError: Se alguma variável obrigatória estiver ausente.
+    """
+    load_dotenv()
+    config = Settings(
+        NOTION_API_KEY=os.getenv("NOTION_API_KEY"),
+        TASKS_DB_ID=os.getenv("NOTION_DB_TAREFAS_ID"),
+        TOPICS_DB_ID=os.getenv("NOTION_DB_TOPICS_ID"),
+        TIME_SLOTS_DB_ID=os.getenv("NOTION_DB_TIME_SLOTS_ID"),
+        SCHEDULES_DB_ID=os.getenv("NOTION_DB_SCHEDULES_ID"),
+        LOCAL_TZ=ZoneInfo("America/Sao_Paulo"),
+    )
+    config.validate_env_vars()
+    return config
+
+
+def __getattr__(name: str):
+    """Resolve `Config` (PEP 562) como a instância única criada por `get_config`.
+
+    Como os módulos importam `Config` diretamente, a leitura do .env ocorre na
+    primeira importação; o ganho é fazê-la uma única vez, não adiá-la.
+
+    Args:
+        name: Nome do atributo procurado no módulo.
+
+    Returns:
+        Instância única de Settings quando `name` é 'Config'.
+
+    Raises:
+        AttributeError: Se o atributo não existir no módulo.
+    """
+    if name == "Config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,47 +1,133 @@
 import asyncio
 import csv
 import datetime
-from typing import List, Dict, Tuple
+import gzip
+import io
+import json
+import os
+from dataclasses import dataclass
+from functools import cached_property
+from operator import attrgetter, itemgetter
+from types import MappingProxyType
+from typing import Any, Callable, FrozenSet, List, Dict, Mapping, Optional, Tuple
 from pathlib import Path
 from config import Config
 from logger import setup_logger
-from notion_api import get_tasks, get_time_slots, create_schedules_in_batches
-from scheduler import generate_available_slots, schedule_tasks
+from notion_api import (
+    close_notion_client,
+    get_tasks,
+    get_time_slots,
+    create_schedules_in_batches,
+)
+from scheduler import ScheduledPart, generate_available_slots, schedule_tasks
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional; o módulo json cobre a ausência
+    orjson = None
 
 logger = setup_logger()
 
+_START_TIME = attrgetter("start_time")
+_DUE_DATE = itemgetter("due_date")
+# Templates com '%' de forma fixa: mais baratos que str.format com acesso a atributos
+_MD_ROW = "| %s | %s | %s | %s | %s | %s | %s |\n"
+_MD_PENDING_ROW = "| %s | %s | %s | Não Agendada |\n"
+_MD_TABLE_HEADER = (
+    "| Atividade | Início | Fim | Duração (h) | Tópico | Status | Vencimento |\n"
+    "|-----------|--------|-----|-------------|--------|--------|------------|\n"
+)
+_MD_PENDING_HEADER = (
+    "\n## Tarefas Não Agendadas\n\n| Tarefa | Vencimento | Duração Estimada | Status |\n"
+    "|--------|------------|------------------|--------|\n"
+)
+# Deslocamentos dos limites dos períodos de exportação a partir de hoje
+_ONE_DAY, _SEVEN_DAYS, _EIGHT_DAYS, _THIRTY_SEVEN_DAYS = (
+    datetime.timedelta(days=days) for days in (1, 7, 8, 37)
+)
+
+CSV_HEADERS = [
+    "Atividade",
+    "Início",
+    "Fim",
+    "Duração (h)",
+    "É Tópico",
+    "Status",
+    "Vencimento",
+]
+
+
+@dataclass(slots=True)
+class PartRow:
+    """Parte agendada já normalizada para exportação."""
+
+    task_id: str
+    name: str
+    start_time: datetime.datetime
+    end_time: datetime.datetime
+    start_str: str
+    end_str: str
+    duration_h: float
+    duration_str: str
+    due_date: Optional[datetime.datetime]
+    due_str: str
+    is_topic: bool
+
+
+@dataclass(slots=True)
+class PendingRow:
+    """Tarefa não agendada já normalizada para exportação."""
+
+    task_id: str
+    name: str
+    due_date: datetime.datetime
+    due_str: str
+    duration_h: Optional[float]
+    duration_str: Optional[str]
+    is_topic: bool
+
 
 class ScheduleExporter:
     """Classe para exportar cronogramas em diferentes formatos."""
 
-    def __init__(self, output_dir: str = "export"):
+    def __init__(self, output_dir: str = "export", compress: bool = False):
         """Inicializa o exportador de cronogramas.
 
         Args:
             output_dir: Diretório onde os arquivos serão salvos (padrão: 'export').
+            compress: Se True, grava os arquivos comprimidos com gzip (sufixo '.gz').
         """
         self.output_dir = Path(output_dir)
+        self.compress = compress
         self.output_dir.mkdir(exist_ok=True)
         self.local_tz = Config.LOCAL_TZ
         self.today = datetime.datetime.now(self.local_tz).date()
 
-    def get_periods(self) -> Dict[str, Tuple[datetime.date, datetime.date]]:
+    @cached_property
+    def periods(self) -> Mapping[str, Tuple[datetime.date, datetime.date]]:
+        """Períodos de exportação, calculados uma única vez a partir de `today`.
+
+        Returns:
+            Mapeamento imutável com nomes dos períodos e tuplas de datas de início e fim.
+        """
+        return MappingProxyType(
+            {
+                "today": (self.today, self.today),
+                "next_7_days": (self.today + _ONE_DAY, self.today + _SEVEN_DAYS),
+                "next_30_days": (
+                    self.today + _EIGHT_DAYS,
+                    self.today + _THIRTY_SEVEN_DAYS,
+                ),
+            }
+        )
+
+    def get_periods(self) -> Mapping[str, Tuple[datetime.date, datetime.date]]:
         """Define os períodos de tempo para exportação.
 
         Returns:
-            Dicionário com nomes dos períodos e tuplas de datas de início e fim.
+            Mapeamento com nomes dos períodos e tuplas de datas de início e fim.
         """
-        return {
-            "today": (self.today, self.today),
-            "next_7_days": (
-                self.today + datetime.timedelta(days=1),
-                self.today + datetime.timedelta(days=7),
-            ),
-            "next_30_days": (
-                self.today + datetime.timedelta(days=8),
-                self.today + datetime.timedelta(days=37),
-            ),
-        }
+        return self.periods
 
     @staticmethod
     def format_datetime(dt: datetime.datetime) -> str:
@@ -53,7 +139,8 @@ class ScheduleExporter:
         Returns:
             String no formato 'YYYY-MM-DD HH:MM'.
         """
-        return dt.strftime("%Y-%m-%d %H:%M")
+        # isoformat não interpreta string de formato; o corte remove o offset do fuso
+        return dt.isoformat(" ", "minutes")[:16]
 
     @staticmethod
     def calculate_duration(start: datetime.datetime, end: datetime.datetime) -> float:
@@ -68,300 +155,422 @@ class ScheduleExporter:
         """
         return (end - start).total_seconds() / 3600
 
-    def _filter_by_period(
-        self,
-        items: List[Dict],
-        start_date: datetime.date,
-        end_date: datetime.date,
-        date_key: str,
-    ) -> List[Dict]:
-        """Filtra itens por período de datas.
+    def _bucket_by_period(
+        self, items: List[Any], date_of: Callable[[Any], datetime.datetime]
+    ) -> Dict[str, List[Any]]:
+        """Distribui itens entre os períodos de exportação em uma única varredura.
 
         Args:
-            items: Lista de dicionários a serem filtrados.
-            start_date: Data inicial do período.
-            end_date: Data final do período.
-            date_key: Chave do dicionário que contém a data a ser filtrada.
+            items: Lista de itens a serem distribuídos.
+            date_of: Função que extrai de cada item a data usada na distribuição.
 
         Returns:
-            Lista de itens filtrados.
+            Dicionário com o nome de cada período e seus itens, na ordem original.
         """
-        return [
-            item for item in items if start_date <= item[date_key].date() <= end_date
+        today_ordinal = self.today.toordinal()
+        bounds = [
+            (
+                period_name,
+                start_date.toordinal() - today_ordinal,
+                end_date.toordinal() - today_ordinal,
+            )
+            for period_name, (start_date, end_date) in self.periods.items()
         ]
-
-    def generate_txt(
-        self,
-        scheduled_parts: List[Dict],
-        unscheduled_tasks: List[Dict],
-        period_name: str,
-        start_date: datetime.date,
-        end_date: datetime.date,
-    ):
-        """Gera um arquivo TXT com o cronograma legível.
+        buckets = {period_name: [] for period_name, _, _ in bounds}
+        for item in items:
+            # datetime herda toordinal de date, dispensando o objeto date intermediário
+            offset = date_of(item).toordinal() - today_ordinal
+            for period_name, low, high in bounds:
+                if low <= offset <= high:
+                    buckets[period_name].append(item)
+                    break
+        return buckets
+
+    def _to_rows(self, parts: List[ScheduledPart]) -> List[PartRow]:
+        """Converte partes agendadas em linhas normalizadas, uma única vez.
 
         Args:
-            scheduled_parts: Lista de partes agendadas.
-            unscheduled_tasks: Lista de tarefas não agendadas.
-            period_name: Nome do período (ex.: 'today').
-            start_date: Data inicial do período.
-            end_date: Data final do período.
+            parts: Lista de partes agendadas.
+
+        Returns:
+            Lista de PartRow com datas, duração e vencimento já formatados.
         """
-        file_path = self.output_dir / f"schedule_{period_name}.txt"
-        tasks_by_activity = {}
-        unscheduled_names = {
-            task["name"] for task in unscheduled_tasks
-        }  # Usar nomes para verificar
-
-        for (
-            part
-        ) in self._filter_by_period(  # Correção aqui: removido espaço e "submissions"
-            scheduled_parts, start_date, end_date, "start_time"
-        ):
-            activity_name = part["name"]  # Usar o nome como chave
-            tasks_by_activity.setdefault(activity_name, []).append(part)
-
-        with file_path.open("w", encoding="utf-8") as f:
-            f.write(
-                f"Cronograma - {period_name.replace('_', ' ').title()} ({start_date} a {end_date})\n\n"
-            )
-            f.write("=== Tarefas Agendadas ===\n\n")
-            for activity_name, parts in tasks_by_activity.items():
-                part = parts[0]
-                display_name = (
-                    f"[{activity_name}] (Tópico)" if part["is_topic"] else activity_name
+        rows = []
+        # Todas as partes de uma tarefa compartilham o vencimento: formata uma vez
+        due_strs: Dict[str, str] = {}
+        for part in parts:
+            task_id = part.task_id
+            due_date = part.due_date
+            if not isinstance(due_date, datetime.datetime):
+                due_date = None
+            due_str = due_strs.get(task_id)
+            if due_str is None:
+                due_str = due_strs[task_id] = (
+                    self.format_datetime(due_date) if due_date else "N/A"
                 )
-                status = (
-                    "Agendada"
-                    if activity_name not in unscheduled_names
-                    else "Parcialmente Agendada"
+            duration_h = self.calculate_duration(part.start_time, part.end_time)
+            rows.append(
+                PartRow(
+                    task_id=task_id,
+                    name=part.name,
+                    start_time=part.start_time,
+                    end_time=part.end_time,
+                    start_str=self.format_datetime(part.start_time),
+                    end_str=self.format_datetime(part.end_time),
+                    duration_h=duration_h,
+                    duration_str=f"{duration_h:.2f}",
+                    due_date=due_date,
+                    due_str=due_str,
+                    is_topic=bool(part.is_topic),
                 )
-                due_date = (
-                    self.format_datetime(part["due_date"])
-                    if isinstance(part["due_date"], datetime.datetime)
-                    else "N/A"
-                )
-                f.write(
-                    f"Atividade: {display_name}\n  Status: {status}\n  Vencimento: {due_date}\n"
-                )
-                for p in sorted(parts, key=lambda x: x["start_time"]):
-                    start, end = self.format_datetime(
-                        p["start_time"]
-                    ), self.format_datetime(p["end_time"])
-                    duration = self.calculate_duration(p["start_time"], p["end_time"])
-                    f.write(f"  - {start} até {end} (Duração: {duration:.2f} horas)\n")
-                f.write("\n")
-
-            if unscheduled_tasks:
-                f.write("=== Tarefas Não Agendadas ===\n\n")
-                for task in self._filter_by_period(
-                    unscheduled_tasks, start_date, end_date, "due_date"
-                ):
-                    duration = (
-                        f"{task['duration'] / 3600:.2f} horas"
-                        if isinstance(task["duration"], (int, float))
-                        else "N/A"
-                    )
-                    f.write(
-                        f"Tarefa: {task['name']}\n  Status: Não Agendada\n  Vencimento: {self.format_datetime(task['due_date'])}\n  Duração Estimada: {duration}\n\n"
-                    )
-
-            f.write(
-                f"Total de partes agendadas: {len(scheduled_parts)}\nTotal de tarefas não agendadas: {len(unscheduled_tasks)}\n"
             )
-        logger.info(f"Arquivo TXT gerado: {file_path}")
-
-    def generate_markdown(
-        self,
-        scheduled_parts: List[Dict],
-        unscheduled_tasks: List[Dict],
-        period_name: str,
-        start_date: datetime.date,
-        end_date: datetime.date,
-    ):
-        """Gera um arquivo Markdown com tabela de cronograma.
+        return rows
+
+    def _to_pending_rows(self, tasks: List[Dict]) -> List[PendingRow]:
+        """Converte tarefas não agendadas em linhas normalizadas, uma única vez.
 
         Args:
-            scheduled_parts: Lista de partes agendadas.
-            unscheduled_tasks: Lista de tarefas não agendadas.
-            period_name: Nome do período (ex.: 'today').
-            start_date: Data inicial do período.
-            end_date: Data final do período.
+            tasks: Lista de tarefas não agendadas.
+
+        Returns:
+            Lista de PendingRow com vencimento e duração estimada já formatados.
         """
-        file_path = self.output_dir / f"schedule_{period_name}.md"
-        unscheduled_names = {
-            task["name"] for task in unscheduled_tasks
-        }  # Usar nomes para verificar
-
-        with file_path.open("w", encoding="utf-8") as f:
-            f.write(
-                f"# Cronograma - {period_name.replace('_', ' ').title()} ({start_date} a {end_date})\n\n## Tarefas Agendadas\n\n"
+        rows = []
+        for task in tasks:
+            duration = task["duration"]
+            duration_h = (
+                duration / 3600 if isinstance(duration, (int, float)) else None
             )
-            f.write(
-                "| Atividade | Início | Fim | Duração (h) | Tópico | Status | Vencimento |\n"
-                "|-----------|--------|-----|-------------|--------|--------|------------|\n"
-            )
-            for part in sorted(
-                self._filter_by_period(
-                    scheduled_parts, start_date, end_date, "start_time"
-                ),
-                key=lambda x: x["start_time"],
-            ):
-                due_date = (
-                    self.format_datetime(part["due_date"])
-                    if isinstance(part["due_date"], datetime.datetime)
-                    else "N/A"
-                )
-                status = (
-                    "Agendada"
-                    if part["name"] not in unscheduled_names
-                    else "Parcialmente Agendada"
-                )
-                f.write(
-                    f"| {part['name']} | {self.format_datetime(part['start_time'])} | {self.format_datetime(part['end_time'])} | {self.calculate_duration(part['start_time'], part['end_time']):.2f} | {'Sim' if part['is_topic'] else 'Não'} | {status} | {due_date} |\n"
+            rows.append(
+                PendingRow(
+                    task_id=task["id"],
+                    name=task["name"],
+                    due_date=task["due_date"],
+                    due_str=self.format_datetime(task["due_date"]),
+                    duration_h=duration_h,
+                    duration_str=(
+                        f"{duration_h:.2f}" if duration_h is not None else None
+                    ),
+                    is_topic=task.get("is_topic", False),
                 )
-
-            if unscheduled_tasks:
-                f.write(
-                    "\n## Tarefas Não Agendadas\n\n| Tarefa | Vencimento | Duração Estimada | Status |\n"
-                    "|--------|------------|------------------|--------|\n"
-                )
-                for task in self._filter_by_period(
-                    unscheduled_tasks, start_date, end_date, "due_date"
-                ):
-                    duration = (
-                        f"{task['duration'] / 3600:.2f} h"
-                        if isinstance(task["duration"], (int, float))
-                        else "N/A"
-                    )
-                    f.write(
-                        f"| {task['name']} | {self.format_datetime(task['due_date'])} | {duration} | Não Agendada |\n"
-                    )
-
-            f.write(
-                f"\n**Total de partes agendadas:** {len(scheduled_parts)}\n**Total de tarefas não agendadas:** {len(unscheduled_tasks)}\n"
             )
-        logger.info(f"Arquivo Markdown gerado: {file_path}")
-
-    def generate_csv(
-        self,
-        scheduled_parts: List[Dict],
-        unscheduled_tasks: List[Dict],
-        period_name: str,
-        start_date: datetime.date,
-        end_date: datetime.date,
-    ):
-        """Gera um arquivo CSV com o cronograma.
-
-        Args:
-            scheduled_parts: Lista de partes agendadas.
-            unscheduled_tasks: Lista de tarefas não agendadas.
-            period_name: Nome do período (ex.: 'today').
-            start_date: Data inicial do período.
-            end_date: Data final do período.
-        """
-        file_path = self.output_dir / f"schedule_{period_name}.csv"
-        headers = [
-            "Atividade",
-            "Início",
-            "Fim",
-            "Duração (h)",
-            "É Tópico",
-            "Status",
-            "Vencimento",
-        ]
-        unscheduled_names = {
-            task["name"] for task in unscheduled_tasks
-        }  # Usar nomes para verificar
-
-        with file_path.open("w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=headers)
-            writer.writeheader()
-            for part in sorted(
-                self._filter_by_period(
-                    scheduled_parts, start_date, end_date, "start_time"
-                ),
-                key=lambda x: x["start_time"],
-            ):
-                due_date = (
-                    self.format_datetime(part["due_date"])
-                    if isinstance(part["due_date"], datetime.datetime)
-                    else "N/A"
-                )
-                status = (
-                    "Agendada"
-                    if part["name"] not in unscheduled_names
-                    else "Parcialmente Agendada"
-                )
-                writer.writerow(
-                    {
-                        "Atividade": part["name"],
-                        "Início": self.format_datetime(part["start_time"]),
-                        "Fim": self.format_datetime(part["end_time"]),
-                        "Duração (h)": f"{self.calculate_duration(part['start_time'], part['end_time']):.2f}",
-                        "É Tópico": part["is_topic"],
-                        "Status": status,
-                        "Vencimento": due_date,
-                    }
-                )
-            for task in self._filter_by_period(
-                unscheduled_tasks, start_date, end_date, "due_date"
-            ):
-                duration = (
-                    f"{task['duration'] / 3600:.2f}"
-                    if isinstance(task["duration"], (int, float))
-                    else "N/A"
-                )
-                writer.writerow(
-                    {
-                        "Atividade": task["name"],
-                        "Início": "",
-                        "Fim": "",
-                        "Duração (h)": duration,
-                        "É Tópico": task.get("is_topic", False),
-                        "Status": "Não Agendada",
-                        "Vencimento": self.format_datetime(task["due_date"]),
-                    }
-                )
-        logger.info(f"Arquivo CSV gerado: {file_path}")
+        return rows
 
     async def export_schedules(
-        self, scheduled_parts: List[Dict], unscheduled_tasks: List[Dict]
+        self, scheduled_parts: List[ScheduledPart], unscheduled_tasks: List[Dict]
     ):
-        """Exporta o cronograma para os três formatos em todos os períodos.
+        """Exporta o cronograma para todos os formatos em todos os períodos.
 
         Args:
             scheduled_parts: Lista de partes agendadas.
             unscheduled_tasks: Lista de tarefas não agendadas.
         """
-        for period_name, (start_date, end_date) in self.get_periods().items():
-            self.generate_txt(
-                scheduled_parts, unscheduled_tasks, period_name, start_date, end_date
+        parts_by_period = self._bucket_by_period(scheduled_parts, _START_TIME)
+        pending_by_period = self._bucket_by_period(unscheduled_tasks, _DUE_DATE)
+        rows_by_period = {
+            period_name: self._to_rows(parts)
+            for period_name, parts in parts_by_period.items()
+        }
+        pending_rows_by_period = {
+            period_name: self._to_pending_rows(tasks)
+            for period_name, tasks in pending_by_period.items()
+        }
+        unscheduled_ids = frozenset(task["id"] for task in unscheduled_tasks)
+        # Os períodos não compartilham estado mutável, então a formatação roda em threads
+        rendered = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    render_period_files,
+                    rows_by_period[period_name],
+                    pending_rows_by_period[period_name],
+                    len(scheduled_parts),
+                    len(unscheduled_tasks),
+                    unscheduled_ids,
+                    period_name,
+                    start_date,
+                    end_date,
+                )
+                for period_name, (start_date, end_date) in self.periods.items()
             )
-            self.generate_markdown(
-                scheduled_parts, unscheduled_tasks, period_name, start_date, end_date
+        )
+        files = {
+            self.output_dir / f"schedule_{period_name}.{ext}": body
+            for period_name, bodies in zip(self.periods, rendered)
+            for ext, body in bodies.items()
+        }
+        for path in await asyncio.to_thread(write_files, files, self.compress):
+            logger.info(f"Arquivo gerado: {path}")
+
+
+def _dumps_line(record: Dict) -> bytes:
+    """Serializa um registro como uma linha JSON terminada em quebra de linha.
+
+    Args:
+        record: Dicionário a ser serializado.
+
+    Returns:
+        Linha JSON codificada em UTF-8.
+    """
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _jsonl_record(
+    task_id: str,
+    name: str,
+    start: Optional[datetime.datetime],
+    end: Optional[datetime.datetime],
+    duration_h: Optional[float],
+    due: Optional[datetime.datetime],
+    status: str,
+) -> Dict[str, Any]:
+    """Monta o registro tipado de uma linha do JSONL.
+
+    Args:
+        task_id: ID da tarefa no Notion.
+        name: Nome da tarefa.
+        start: Início da parte, ou None para tarefas não agendadas.
+        end: Fim da parte, ou None para tarefas não agendadas.
+        duration_h: Duração em horas, ou None se desconhecida.
+        due: Data de vencimento, ou None se ausente.
+        status: Status de agendamento da tarefa.
+
+    Returns:
+        Dicionário com chaves estáveis, horas numéricas e datas em ISO 8601.
+    """
+    return {
+        "task_id": task_id,
+        "name": name,
+        "start": start.isoformat() if start else None,
+        "end": end.isoformat() if end else None,
+        "duration_h": duration_h,
+        "due": due.isoformat() if due else None,
+        "status": status,
+    }
+
+
+def _write_bytes_file(path: Path, body: bytes) -> None:
+    """Grava bytes no arquivo com uma única sequência de os.write.
+
+    Args:
+        path: Caminho do arquivo de destino.
+        body: Conteúdo completo do arquivo.
+    """
+    data = memoryview(body)
+    fd = os.open(
+        path,
+        os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0),
+        0o644,
+    )
+    try:
+        while data:
+            data = data[os.write(fd, data) :]
+    finally:
+        os.close(fd)
+
+
+def write_files(files: Dict[Path, bytes], compress: bool = False) -> List[Path]:
+    """Grava todos os arquivos da exportação em sequência.
+
+    Args:
+        files: Dicionário com o caminho de cada arquivo e seu conteúdo.
+        compress: Se True, comprime cada conteúdo com gzip e acrescenta '.gz' ao nome.
+
+    Returns:
+        Caminhos dos arquivos gravados, na ordem recebida.
+    """
+    written = []
+    for path, body in files.items():
+        if compress:
+            # Nível 1: a maior parte da redução de tamanho com custo mínimo de CPU
+            path = path.with_name(f"{path.name}.gz")
+            body = gzip.compress(body, compresslevel=1)
+        _write_bytes_file(path, body)
+        written.append(path)
+    return written
+
+
+def render_period_files(
+    rows: List[PartRow],
+    pending: List[PendingRow],
+    total_parts: int,
+    total_unscheduled: int,
+    unscheduled_ids: FrozenSet[str],
+    period_name: str,
+    start_date: datetime.date,
+    end_date: datetime.date,
+) -> Dict[str, bytes]:
+    """Formata os conteúdos TXT, Markdown, CSV e JSONL de um período em uma única passada.
+
+    Função pura de módulo: recebe apenas os dados já filtrados do período e
+    devolve os conteúdos codificados, sem tocar no disco.
+
+    Args:
+        rows: Partes agendadas, já normalizadas, que começam dentro do período.
+        pending: Tarefas não agendadas, já normalizadas, que vencem dentro do período.
+        total_parts: Total de partes agendadas em todos os períodos.
+        total_unscheduled: Total de tarefas não agendadas em todos os períodos.
+        unscheduled_ids: IDs das tarefas não agendadas.
+        period_name: Nome do período (ex.: 'today').
+        start_date: Data inicial do período.
+        end_date: Data final do período.
+
+    Returns:
+        Dicionário com a extensão de cada arquivo e seu conteúdo em UTF-8.
+    """
+    title = f"{period_name.replace('_', ' ').title()} ({start_date} a {end_date})"
+
+    # O cabeçalho de cada atividade no TXT vem da primeira parte na ordem original
+    first_rows = {}
+    for row in rows:
+        first_rows.setdefault(row.name, row)
+    tasks_by_activity = {name: [] for name in first_rows}
+
+    txt_lines = [f"Cronograma - {title}\n\n=== Tarefas Agendadas ===\n\n"]
+    md_lines = [
+        f"# Cronograma - {title}\n\n## Tarefas Agendadas\n\n",
+        _MD_TABLE_HEADER,
+    ]
+    csv_rows = [CSV_HEADERS]
+    jsonl_lines = []
+
+    for row in sorted(rows, key=_START_TIME):
+        tasks_by_activity[row.name].append(row)
+        status = (
+            "Agendada"
+            if row.task_id not in unscheduled_ids
+            else "Parcialmente Agendada"
+        )
+        md_lines.append(
+            _MD_ROW
+            % (
+                row.name,
+                row.start_str,
+                row.end_str,
+                row.duration_str,
+                "Sim" if row.is_topic else "Não",
+                status,
+                row.due_str,
+            )
+        )
+        csv_rows.append(
+            (
+                row.name,
+                row.start_str,
+                row.end_str,
+                row.duration_str,
+                row.is_topic,
+                status,
+                row.due_str,
+            )
+        )
+        jsonl_lines.append(
+            _dumps_line(
+                _jsonl_record(
+                    row.task_id,
+                    row.name,
+                    row.start_time,
+                    row.end_time,
+                    row.duration_h,
+                    row.due_date,
+                    status,
+                )
+            )
+        )
+
+    for activity_name, activity_rows in tasks_by_activity.items():
+        first = first_rows[activity_name]
+        display_name = (
+            f"[{activity_name}] (Tópico)" if first.is_topic else activity_name
+        )
+        status = (
+            "Agendada"
+            if first.task_id not in unscheduled_ids
+            else "Parcialmente Agendada"
+        )
+        txt_lines.append(
+            f"Atividade: {display_name}\n  Status: {status}\n  Vencimento: {first.due_str}\n"
+        )
+        txt_lines.extend(
+            f"  - {row.start_str} até {row.end_str} (Duração: {row.duration_str} horas)\n"
+            for row in activity_rows
+        )
+        txt_lines.append("\n")
+
+    if total_unscheduled:
+        txt_lines.append("=== Tarefas Não Agendadas ===\n\n")
+        md_lines.append(_MD_PENDING_HEADER)
+    for task in pending:
+        duration = task.duration_str
+        txt_lines.append(
+            f"Tarefa: {task.name}\n  Status: Não Agendada\n  Vencimento: {task.due_str}\n  Duração Estimada: {f'{duration} horas' if duration else 'N/A'}\n\n"
+        )
+        md_lines.append(
+            _MD_PENDING_ROW
+            % (task.name, task.due_str, f"{duration} h" if duration else "N/A")
+        )
+        csv_rows.append(
+            (
+                task.name,
+                "",
+                "",
+                duration or "N/A",
+                task.is_topic,
+                "Não Agendada",
+                task.due_str,
             )
-            self.generate_csv(
-                scheduled_parts, unscheduled_tasks, period_name, start_date, end_date
+        )
+        jsonl_lines.append(
+            _dumps_line(
+                _jsonl_record(
+                    task.task_id,
+                    task.name,
+                    None,
+                    None,
+                    task.duration_h,
+                    task.due_date,
+                    "Não Agendada",
+                )
             )
+        )
+
+    txt_lines.append(
+        f"Total de partes agendadas: {total_parts}\nTotal de tarefas não agendadas: {total_unscheduled}\n"
+    )
+    md_lines.append(
+        f"\n**Total de partes agendadas:** {total_parts}\n**Total de tarefas não agendadas:** {total_unscheduled}\n"
+    )
+    csv_buffer = io.StringIO(newline="")
+    csv.writer(csv_buffer).writerows(csv_rows)
+
+    return {
+        "txt": "".join(txt_lines).encode("utf-8"),
+        "md": "".join(md_lines).encode("utf-8"),
+        "csv": csv_buffer.getvalue().encode("utf-8"),
+        "jsonl": b"".join(jsonl_lines),
+    }
 
 
 async def main():
     """Função principal para exportação de cronogramas."""
     exporter = ScheduleExporter()
     time_slots_cache = {"slots": []}
-    tasks, _ = await get_tasks({}, logger)
-    time_slots_data, _ = await get_time_slots(time_slots_cache, logger)
-
-    days_to_schedule = 37
-    available_slots, _, _ = generate_available_slots(
-        time_slots_data, logger, days_to_schedule
-    )
-    scheduled_parts, _, _, unscheduled_tasks = schedule_tasks(
-        tasks, available_slots, logger
-    )
-
-    await exporter.export_schedules(scheduled_parts, unscheduled_tasks)
+    try:
+        tasks, _ = await get_tasks({}, logger)
+        time_slots_data, _ = await get_time_slots(time_slots_cache, logger)
+
+        days_to_schedule = 37
+        available_slots, _, _ = generate_available_slots(
+            time_slots_data, logger, days_to_schedule
+        )
+        scheduled_parts, _, _, unscheduled_tasks = schedule_tasks(
+            tasks, available_slots, logger
+        )
+
+        await exporter.export_schedules(scheduled_parts, unscheduled_tasks)
+    finally:
+        await close_notion_client()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,6 @@
 import os
 import logging
 import colorlog
-from logging.handlers import RotatingFileHandler
 from config import Config
 import datetime
 from pathlib import Path
@@ -10,25 +9,27 @@ from pathlib import Path
 def setup_logger() -> logging.Logger:
     """Configura o logger com saída para arquivo e console.
 
+    Chamadas repetidas (uma por módulo importado) devolvem o mesmo logger sem
+    registrar novos handlers.
+
     Returns:
         Objeto Logger configurado.
     """
+    logger = logging.getLogger("SchedulerLogger")
+    if logger.handlers:
+        return logger
+
     logs_dir = Path(__file__).parent / "logs"
     logs_dir.mkdir(exist_ok=True)
-    log_file = (
-        logs_dir / f"scheduler_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-    )
+    log_file = logs_dir / f"scheduler_{datetime.date.today().strftime('%Y%m%d')}.log"
 
-    logger = logging.getLogger("SchedulerLogger")
     logger.setLevel(getattr(logging, Config.LOG_LEVEL))
+    logger.propagate = False
     log_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
 
     if Config.LOG_TO_FILE:
-        handler = RotatingFileHandler(
-            log_file,
-            maxBytes=Config.LOG_FILE_MAX_SIZE_MB * 1024 * 1024,
-            backupCount=Config.LOG_BACKUP_COUNT,
-        )
+        # Um arquivo por dia dispensa a verificação de tamanho a cada registro
+        handler = logging.FileHandler(log_file, encoding="utf-8")
         handler.setFormatter(log_formatter)
         logger.addHandler(handler)
 
@@ -1,25 +1,32 @@
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 import datetime
-import os
-from typing import List, Tuple, Dict
+import logging
+from typing import Any, List, Tuple, Dict
 from collections import defaultdict
 from pathlib import Path
 from config import Config
 from logger import setup_logger
 from notion_api import (
     clear_schedules_db,
+    close_notion_client,
     get_tasks,
     get_time_slots,
     create_schedules_in_batches,
+    load_schedule_entries,
 )
-from scheduler import generate_available_slots, schedule_tasks
+from scheduler import ScheduledPart, generate_available_slots, schedule_tasks
 from utils import load_cache, save_cache
 
 logger = setup_logger()
 
+_ZERO = datetime.timedelta()
 
-async def calculate_days_to_schedule(
+CACHES_DIR = Path(__file__).resolve().parent / "caches"
+TOPICS_CACHE_FILE = CACHES_DIR / "topics_cache.json"
+TIME_SLOTS_CACHE_FILE = CACHES_DIR / "time_slots_cache.json"
+
+
+def calculate_days_to_schedule(
     tasks: List[Dict], current_date: datetime.date
 ) -> int:
     """Calcula o número de dias necessários para agendamento com base nas tarefas.
@@ -33,8 +40,9 @@ async def calculate_days_to_schedule(
     """
     if not tasks:
         return Config.DAYS_TO_SCHEDULE
-    max_due_date = max(task["due_date"].date() for task in tasks)
-    return max((max_due_date - current_date).days + 1, 1)
+    # toordinal no datetime dá o dia do vencimento sem criar um objeto date por tarefa
+    max_due_ordinal = max(task["due_date"].toordinal() for task in tasks)
+    return max(max_due_ordinal - current_date.toordinal() + 1, 1)
 
 
 async def gather_initial_data(
@@ -59,7 +67,7 @@ async def gather_initial_data(
 
 async def process_scheduling(
     tasks: List[Dict], time_slots_data: List, excluded_dates: List[datetime.date]
-) -> Tuple[List[Dict], List, List[Dict]]:
+) -> Tuple[List[ScheduledPart], List, List[Dict]]:
     """Gera slots disponíveis e agenda tarefas.
 
     Args:
@@ -71,25 +79,21 @@ async def process_scheduling(
         Tupla com partes agendadas, slots originais e tarefas não agendadas.
     """
     current_date = datetime.datetime.now(Config.LOCAL_TZ).date()
-    days_to_schedule = await calculate_days_to_schedule(tasks, current_date)
-
-    loop = asyncio.get_running_loop()
-    with ThreadPoolExecutor() as pool:
-        available_slots, exception_days_count, exception_slots_count = (
-            await loop.run_in_executor(
-                pool,
-                generate_available_slots,
-                time_slots_data,
-                logger,
-                days_to_schedule,
-                excluded_dates,
-            )
-        )
-        scheduled_parts, original_slots, _, unscheduled_tasks = (
-            await loop.run_in_executor(
-                pool, schedule_tasks, tasks, available_slots, logger
-            )
+    days_to_schedule = calculate_days_to_schedule(tasks, current_date)
+
+    # As duas etapas são dependentes; rodam no executor padrão do loop
+    available_slots, exception_days_count, exception_slots_count = (
+        await asyncio.to_thread(
+            generate_available_slots,
+            time_slots_data,
+            logger,
+            days_to_schedule,
+            excluded_dates,
         )
+    )
+    scheduled_parts, original_slots, _, unscheduled_tasks = await asyncio.to_thread(
+        schedule_tasks, tasks, available_slots, logger
+    )
     logger.info(
         f"Dias com exceções: {exception_days_count}, Slots de exceção: {exception_slots_count}"
     )
@@ -97,90 +101,96 @@ async def process_scheduling(
 
 
 def calculate_time_stats(
-    scheduled_parts: List[Dict], original_slots: List
-) -> Dict[str, float]:
-    """Calcula estatísticas de tempo (horas disponíveis, comprometidas e livres).
+    scheduled_parts: List[ScheduledPart], original_slots: List
+) -> Dict[str, Any]:
+    """Calcula as estatísticas de tempo percorrendo cada coleção uma única vez.
 
     Args:
         scheduled_parts: Lista de partes agendadas.
         original_slots: Lista de slots disponíveis originalmente.
 
     Returns:
-        Dicionário com total de horas disponíveis, horas comprometidas e horas livres.
+        Dicionário com total de horas disponíveis, horas comprometidas, horas livres,
+        número de dias agendados e horas livres por número da semana.
     """
-    total_available_hours = sum(
-        (slot[1] - slot[0]).total_seconds() / 3600 for slot in original_slots
-    )
-    committed_hours = sum(
-        (part["end_time"] - part["start_time"]).total_seconds() / 3600
-        for part in scheduled_parts
-    )
+    # Acumula timedeltas (aritmética em C) e converte para horas só no final
+    total_available = _ZERO
+    week_free = defaultdict(datetime.timedelta)
+    # Vários slots e partes caem no mesmo dia: a semana ISO é calculada uma vez por dia
+    week_by_day: Dict[int, int] = {}
+    for start, end in original_slots:
+        duration = end - start
+        total_available += duration
+        day = start.toordinal()
+        week_number = week_by_day.get(day)
+        if week_number is None:
+            week_number = week_by_day[day] = start.isocalendar().week
+        week_free[week_number] += duration
+
+    committed = _ZERO
+    scheduled_days = set()
+    for part in scheduled_parts:
+        start = part.start_time
+        duration = part.end_time - start
+        committed += duration
+        day = start.toordinal()
+        scheduled_days.add(day)
+        week_number = week_by_day.get(day)
+        if week_number is None:
+            week_number = week_by_day[day] = start.isocalendar().week
+        if week_number in week_free:
+            week_free[week_number] -= duration
+
+    total_available_hours = total_available.total_seconds() / 3600
+    committed_hours = committed.total_seconds() / 3600
     return {
         "total_available_hours": total_available_hours,
         "committed_hours": committed_hours,
         "free_hours": total_available_hours - committed_hours,
+        "scheduled_days": len(scheduled_days),
+        "free_hours_per_week": {
+            week: round(free.total_seconds() / 3600, 1)
+            for week, free in week_free.items()
+        },
     }
 
 
-def calculate_weekly_free_hours(
-    scheduled_parts: List[Dict], original_slots: List
-) -> Dict[int, float]:
-    """Calcula horas livres por semana.
-
-    Args:
-        scheduled_parts: Lista de partes agendadas.
-        original_slots: Lista de slots disponíveis originalmente.
-
-    Returns:
-        Dicionário com horas livres por número da semana.
-    """
-    week_hours = defaultdict(float)
-    week_committed = defaultdict(float)
-
-    for slot in original_slots:
-        week_number = slot[0].isocalendar().week
-        week_hours[week_number] += (slot[1] - slot[0]).total_seconds() / 3600
-    for part in scheduled_parts:
-        week_number = part["start_time"].isocalendar().week
-        week_committed[week_number] += (
-            part["end_time"] - part["start_time"]
-        ).total_seconds() / 3600
-
-    return {
-        week: round(week_hours[week] - week_committed.get(week, 0), 1)
-        for week in week_hours
-    }
-
-
-async def main() -> None:
-    """Função principal para execução do agendador."""
+async def run_scheduler() -> None:
+    """Carrega os dados, agenda as tarefas e grava o cronograma no Notion."""
     start_time = datetime.datetime.now()
     logger.info("Script execution started")
 
-    caches_dir = Path(__file__).parent / "caches"
-    caches_dir.mkdir(exist_ok=True)
-    topics_cache_file = caches_dir / "topics_cache.json"
-    time_slots_cache_file = caches_dir / "time_slots_cache.json"
-
-    topics_cache, topics_hash = load_cache(topics_cache_file, "topics_cache", logger)
+    CACHES_DIR.mkdir(exist_ok=True)
+    topics_cache, topics_hash = load_cache(TOPICS_CACHE_FILE, "topics_cache", logger)
     time_slots_cache, slots_hash = load_cache(
-        time_slots_cache_file, "time_slots_cache", logger
+        TIME_SLOTS_CACHE_FILE, "time_slots_cache", logger
     )
 
     tasks, skipped_tasks, time_slots_data, excluded_dates = await gather_initial_data(
         topics_cache, time_slots_cache
     )
-    scheduled_parts, original_slots, unscheduled_tasks = await process_scheduling(
-        tasks, time_slots_data, excluded_dates
+    # A leitura do cronograma atual roda enquanto o agendamento é calculado
+    entries_task = asyncio.create_task(load_schedule_entries(logger))
+    try:
+        scheduled_parts, original_slots, unscheduled_tasks = await process_scheduling(
+            tasks, time_slots_data, excluded_dates
+        )
+    except BaseException:
+        # Sem novo cronograma para inserir, interrompe a leitura em andamento
+        entries_task.cancel()
+        raise
+
+    # Entradas iguais às novas partes são mantidas; só as demais são arquivadas
+    existing_entries = await entries_task
+    insertions = await create_schedules_in_batches(
+        scheduled_parts, logger, existing_entries
     )
+    deleted_entries = await clear_schedules_db(existing_entries, logger)
 
-    deleted_entries = await clear_schedules_db(logger)
-    insertions = await create_schedules_in_batches(scheduled_parts, logger)
-
-    save_cache(topics_cache, topics_cache_file, "topics_cache", logger, topics_hash)
+    save_cache(topics_cache, TOPICS_CACHE_FILE, "topics_cache", logger, topics_hash)
     save_cache(
-        {"slots": time_slots_data},
-        time_slots_cache_file,
+        {"slots": time_slots_data, "excluded_dates": excluded_dates},
+        TIME_SLOTS_CACHE_FILE,
         "time_slots_cache",
         logger,
         slots_hash,
@@ -188,8 +198,6 @@ async def main() -> None:
 
     time_stats = calculate_time_stats(scheduled_parts, original_slots)
     execution_time = (datetime.datetime.now() - start_time).total_seconds()
-    scheduled_days = len({part["start_time"].date() for part in scheduled_parts})
-    free_hours_per_week = calculate_weekly_free_hours(scheduled_parts, original_slots)
 
     stats_lines = [
         "Estatísticas de Execução:",
@@ -202,15 +210,17 @@ async def main() -> None:
         f"• Dias excluídos por exceções sem horários: {len(excluded_dates)}",
         f"• Tempo de execução: {execution_time:.2f} segundos",
         f"• Entradas de cronograma removidas: {deleted_entries}",
-        f"• Dias agendados: {scheduled_days}",
+        f"• Dias agendados: {time_stats['scheduled_days']}",
         "• Horas livres por semana:",
     ]
     stats_lines.extend(
-        f"\t- Semana {week}: {hours}h" for week, hours in free_hours_per_week.items()
+        f"\t- Semana {week}: {hours}h"
+        for week, hours in time_stats["free_hours_per_week"].items()
     )
     logger.info("\n".join(stats_lines))
 
-    if unscheduled_tasks:
+    # Evita montar uma mensagem por tarefa quando avisos estão filtrados
+    if unscheduled_tasks and logger.isEnabledFor(logging.WARNING):
         logger.warning("Tarefas não agendadas:")
         for task in unscheduled_tasks:
             reason = task.get("unscheduled_reason", "Motivo não especificado")
@@ -221,5 +231,18 @@ async def main() -> None:
     logger.info("Execução do script concluída")
 
 
+async def main() -> None:
+    """Função principal para execução do agendador."""
+    try:
+        await run_scheduler()
+    finally:
+        await close_notion_client()
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop
+    except ImportError:  # uvloop é opcional e não existe no Windows
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -1,15 +1,229 @@
 import asyncio
-from functools import wraps
+import inspect
+import random
+from collections import defaultdict
+from functools import lru_cache, wraps
 import datetime
-from typing import List, Dict, Tuple, Optional
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    List,
+    Dict,
+    Tuple,
+    Optional,
+    TypeVar,
+)
+import httpx
 from notion_client import AsyncClient
-from config import Config
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
+from config import Config, DAY_MAP_INV, DayOfWeek
+from scheduler import ScheduledPart
+
+# Um único pool de conexões, dimensionado para o limite de requisições simultâneas
+notion = AsyncClient(
+    auth=Config.NOTION_API_KEY,
+    client=httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=Config.NOTION_MAX_CONCURRENT_REQUESTS,
+            max_keepalive_connections=Config.NOTION_MAX_CONCURRENT_REQUESTS,
+        )
+    ),
+)
+# Limite global de requisições simultâneas ao Notion, compartilhado por todos os fan-outs
+_notion_semaphore = asyncio.Semaphore(Config.NOTION_MAX_CONCURRENT_REQUESTS)
+
+T = TypeVar("T")
+
+# Falhas transitórias que justificam nova tentativa; erros de programação propagam
+RETRYABLE_ERRORS = (HTTPResponseError, RequestTimeoutError, httpx.TransportError)
+# Status HTTP do Notion que indicam conflito, limite de taxa ou falha do servidor
+RETRYABLE_STATUS = frozenset({409, 429, 500, 502, 503, 504})
+
+# Filtro de itens não concluídos, comum às bases de atividades e de tópicos
+NOT_DONE_FILTER = {
+    "property": "Status",
+    "formula": {"string": {"does_not_equal": "✅ Concluído"}},
+}
+# Nome IANA do fuso local enviado nas datas do cronograma
+LOCAL_TZ_NAME = Config.LOCAL_TZ.key
+# Banco de destino das entradas criadas no cronograma
+SCHEDULES_PARENT = {"database_id": Config.SCHEDULES_DB_ID}
+# Identifica uma entrada do cronograma: nome, início, fim, tópicos e atividades
+ScheduleKey = Tuple[
+    Optional[str],
+    Optional[datetime.datetime],
+    Optional[datetime.datetime],
+    Tuple[str, ...],
+    Tuple[str, ...],
+]
+# Nomes dos dias indexados por date.weekday(), sem depender de strftime e do locale
+_WEEKDAY_EN = tuple(day.value for day in DayOfWeek)
+_WEEKDAY_PT = tuple(DAY_MAP_INV[day].capitalize() for day in _WEEKDAY_EN)
+
+
+class RateLimiter:
+    """Espaça o início das requisições para manter uma taxa média constante.
+
+    Em vez de rajadas seguidas de erros 429, cada chamada reserva o próximo
+    instante livre e aguarda até ele, mantendo o fluxo contínuo de requisições.
+    """
+
+    def __init__(self, requests_per_second: float):
+        """Inicializa o limitador.
+
+        Args:
+            requests_per_second: Taxa média máxima de requisições por segundo.
+        """
+        self.interval = 1 / requests_per_second
+        self.next_start = 0.0
+
+    async def wait(self) -> None:
+        """Aguarda até o próximo instante livre para iniciar uma requisição."""
+        now = asyncio.get_running_loop().time()
+        start = max(now, self.next_start)
+        self.next_start = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+# Taxa média aceita pela API do Notion (cerca de 3 requisições por segundo)
+_rate_limiter = RateLimiter(Config.NOTION_REQUESTS_PER_SECOND)
+
+
+async def _call(request: Callable[[], Awaitable[T]]) -> T:
+    """Executa uma chamada à API do Notion respeitando concorrência e taxa.
+
+    Args:
+        request: Função sem argumentos que cria a corrotina da chamada.
+
+    Returns:
+        Resultado da chamada.
+    """
+    async with _notion_semaphore:
+        await _rate_limiter.wait()
+        return await request()
+
+
+def _title(properties: Dict, key: str) -> Optional[str]:
+    """Lê o texto da primeira parte de uma propriedade do tipo título.
+
+    Args:
+        properties: Propriedades da página do Notion.
+        key: Nome da propriedade.
+
+    Returns:
+        Texto do título ou None se ausente ou vazio.
+    """
+    prop = properties.get(key)
+    if prop:
+        title = prop.get("title")
+        if title:
+            return title[0].get("plain_text")
+    return None
+
+
+def _rich_text(properties: Dict, key: str) -> Optional[str]:
+    """Lê o texto da primeira parte de uma propriedade do tipo texto.
+
+    Args:
+        properties: Propriedades da página do Notion.
+        key: Nome da propriedade.
+
+    Returns:
+        Texto da propriedade ou None se ausente ou vazio.
+    """
+    prop = properties.get(key)
+    if prop:
+        rich_text = prop.get("rich_text")
+        if rich_text:
+            return rich_text[0].get("plain_text")
+    return None
+
+
+def _number(properties: Dict, key: str) -> Optional[float]:
+    """Lê o valor de uma propriedade numérica.
 
-notion = AsyncClient(auth=Config.NOTION_API_KEY)
+    Args:
+        properties: Propriedades da página do Notion.
+        key: Nome da propriedade.
+
+    Returns:
+        Valor numérico ou None se ausente.
+    """
+    prop = properties.get(key)
+    return prop.get("number") if prop else None
+
+
+def _date_start(properties: Dict, key: str) -> Optional[str]:
+    """Lê o início de uma propriedade do tipo data.
+
+    Args:
+        properties: Propriedades da página do Notion.
+        key: Nome da propriedade.
+
+    Returns:
+        Data de início em formato ISO ou None se ausente.
+    """
+    prop = properties.get(key)
+    if prop:
+        date = prop.get("date")
+        if date:
+            return date.get("start")
+    return None
+
+
+def _select_name(properties: Dict, key: str) -> Optional[str]:
+    """Lê o nome da opção escolhida em uma propriedade do tipo seleção.
+
+    Args:
+        properties: Propriedades da página do Notion.
+        key: Nome da propriedade.
+
+    Returns:
+        Nome da opção ou None se nada estiver selecionado.
+    """
+    prop = properties.get(key)
+    if prop:
+        select = prop.get("select")
+        if select:
+            return select.get("name")
+    return None
+
+
+async def close_notion_client() -> None:
+    """Fecha o pool de conexões do cliente do Notion."""
+    await notion.aclose()
+
+
+def _retry_delay(error: Exception, attempt: int, delay: float) -> float:
+    """Calcula a espera antes da próxima tentativa.
+
+    Usa backoff exponencial com jitter, para que chamadas concorrentes não
+    repitam juntas, e respeita o cabeçalho Retry-After de respostas 429.
+
+    Args:
+        error: Exceção que causou a falha.
+        attempt: Índice da tentativa que falhou, a partir de zero.
+        delay: Tempo inicial de espera entre tentativas (em segundos).
+
+    Returns:
+        Tempo de espera em segundos.
+    """
+    wait = delay * (2**attempt) + random.uniform(0, 0.5)
+    if isinstance(error, HTTPResponseError) and error.status == 429:
+        try:
+            wait = max(wait, float(error.headers.get("retry-after", 0)))
+        except ValueError:
+            pass
+    return wait
 
 
 def retry(max_attempts: int = 3, delay: int = 1):
-    """Decorator para retentativas em caso de falha em chamadas à API.
+    """Decorator para retentativas em caso de falhas transitórias da API.
+
+    Apenas erros de rede, timeouts e respostas HTTP em RETRYABLE_STATUS são
+    repetidos; qualquer outra exceção é propagada na primeira ocorrência.
 
     Args:
         max_attempts: Número máximo de tentativas.
@@ -20,23 +234,61 @@ def retry(max_attempts: int = 3, delay: int = 1):
     """
 
     def decorator(func):
+        # Posição do parâmetro 'logger', resolvida uma vez por função decorada
+        logger_index = list(inspect.signature(func).parameters).index("logger")
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            logger = kwargs.get("logger", args[-1] if args else None)
+            if "logger" in kwargs:
+                logger = kwargs["logger"]
+            else:
+                logger = args[logger_index] if len(args) > logger_index else None
             for attempt in range(max_attempts):
                 try:
                     return await func(*args, **kwargs)
-                except Exception as e:
-                    if attempt == max_attempts - 1:
+                except RETRYABLE_ERRORS as e:
+                    if attempt == max_attempts - 1 or (
+                        isinstance(e, HTTPResponseError)
+                        and e.status not in RETRYABLE_STATUS
+                    ):
                         raise
-                    logger.warning(f"Tentativa {attempt + 1} falhou: {e}")
-                    await asyncio.sleep(delay * (2**attempt))
+                    wait = _retry_delay(e, attempt, delay)
+                    if logger is not None:
+                        logger.warning(
+                            f"Tentativa {attempt + 1} falhou: {e}. Nova tentativa em {wait:.1f}s"
+                        )
+                    await asyncio.sleep(wait)
 
         return wrapper
 
     return decorator
 
 
+@lru_cache(maxsize=2048)
+def _parse_date(date_str: str) -> datetime.datetime:
+    """Converte string ISO em datetime com timezone, memoizando datas repetidas.
+
+    Args:
+        date_str: String de data no formato ISO.
+
+    Returns:
+        Objeto datetime com timezone local (ou o offset presente na string).
+    """
+    if len(date_str) == 10:
+        # Caminho rápido para datas sem horário ('YYYY-MM-DD'), o formato mais comum
+        return datetime.datetime.combine(
+            datetime.date.fromisoformat(date_str), datetime.time(), Config.LOCAL_TZ
+        )
+    if "Z" in date_str:
+        date_str = date_str.replace("Z", "")
+    naive_date = datetime.datetime.fromisoformat(date_str)
+    return (
+        naive_date.replace(tzinfo=Config.LOCAL_TZ)
+        if naive_date.tzinfo is None
+        else naive_date
+    )
+
+
 def parse_date(date_str: str, logger) -> datetime.datetime:
     """Converte string de data para datetime com timezone, preservando horário se presente.
 
@@ -47,64 +299,188 @@ def parse_date(date_str: str, logger) -> datetime.datetime:
     Returns:
         Objeto datetime com timezone local.
     """
-    naive_date = datetime.datetime.fromisoformat(date_str.replace("Z", ""))
-    if naive_date.hour == naive_date.minute == naive_date.second == 0:
+    parsed = _parse_date(date_str)
+    if parsed.hour == parsed.minute == parsed.second == 0:
         logger.debug(f"Data {date_str} sem horário, assumindo 00:00")
-    return (
-        Config.LOCAL_TZ.localize(naive_date)
-        if naive_date.tzinfo is None
-        else naive_date
-    )
+    return parsed
 
 
 @retry()
-async def clear_schedules_db(logger) -> int:
-    """Limpa a base de cronogramas arquivando todas as entradas.
+async def archive_page(page_id: str, logger) -> None:
+    """Arquiva uma página do Notion.
+
+    Args:
+        page_id: ID da página a ser arquivada.
+        logger: Objeto de log para registrar mensagens.
+    """
+    await _call(lambda: notion.pages.update(page_id=page_id, archived=True))
+
+
+async def load_schedule_entries(logger) -> Dict[ScheduleKey, List[str]]:
+    """Indexa as entradas atuais do cronograma para reaproveitamento.
 
     Args:
         logger: Objeto de log para registrar mensagens.
 
     Returns:
-        Número de entradas removidas.
+        IDs das páginas existentes agrupados pela chave da entrada; vazio se a
+        limpeza da base estiver desativada.
     """
     if not Config.SCHEDULE_CLEAR_DB:
         logger.info("Limpeza da base de cronogramas desativada")
+        return {}
+    entries: Dict[ScheduleKey, List[str]] = {}
+    total = 0
+    async for pages in iterate_notion_pages(Config.SCHEDULES_DB_ID, None, logger):
+        for page in pages:
+            entries.setdefault(_page_entry_key(page), []).append(page["id"])
+        total += len(pages)
+    logger.info(f"{total} entradas existentes no cronograma")
+    return entries
+
+
+async def clear_schedules_db(
+    existing_entries: Dict[ScheduleKey, List[str]], logger
+) -> int:
+    """Arquiva as entradas existentes que não foram reaproveitadas.
+
+    Como as novas entradas já foram criadas, uma entrada que não pode ser
+    arquivada fica duplicada no cronograma; cada falha é registrada com o ID da
+    página para que possa ser removida manualmente.
+
+    Args:
+        existing_entries: Entradas restantes após `create_schedules_in_batches`.
+        logger: Objeto de log para registrar mensagens.
+
+    Returns:
+        Número de entradas removidas; 0 se não houver entradas, como quando a
+        limpeza da base está desativada.
+
+    Raises:
+        Exception: Erros que não vêm da API do Notion são repassados.
+    """
+    if not existing_entries:
         return 0
-    logger.info("Iniciando limpeza da base de cronogramas")
-    response = await notion.databases.query(Config.SCHEDULES_DB_ID)
-    pages = response["results"]
-    if pages:
-        await asyncio.gather(
-            *[notion.pages.update(page_id=page["id"], archived=True) for page in pages]
+    page_ids = [page_id for ids in existing_entries.values() for page_id in ids]
+    results = await asyncio.gather(
+        *(archive_page(page_id, logger) for page_id in page_ids),
+        return_exceptions=True,
+    )
+    failures = 0
+    for page_id, result in zip(page_ids, results):
+        if isinstance(result, BaseException):
+            if not isinstance(result, RETRYABLE_ERRORS):
+                raise result
+            failures += 1
+            logger.error(f"Falha ao arquivar a entrada {page_id}: {result}")
+    deleted = len(page_ids) - failures
+    logger.info(f"Base de cronogramas limpa: {deleted} entradas removidas")
+    if failures:
+        logger.warning(
+            f"{failures} entradas antigas não puderam ser arquivadas e continuam "
+            "duplicadas no cronograma"
         )
-    logger.info(f"Base de cronogramas limpa: {len(pages)} entradas removidas")
-    return len(pages)
+    return deleted
+
+
+@retry()
+async def query_database(database_id: str, query_args: Dict, logger=None) -> Dict:
+    """Executa uma única consulta paginada a uma base de dados do Notion.
+
+    Args:
+        database_id: ID da base de dados no Notion.
+        query_args: Argumentos da consulta (filtro, tamanho e cursor da página).
+        logger: Objeto de log para registrar mensagens (opcional).
+
+    Returns:
+        Resposta da API com os resultados da página.
+    """
+    return await _call(lambda: notion.databases.query(database_id, **query_args))
+
+
+async def iterate_notion_pages(
+    database_id: str,
+    filter_conditions: Optional[Dict] = None,
+    logger=None,
+    page_size: int = 100,
+) -> AsyncIterator[List[Dict]]:
+    """Percorre as páginas de uma consulta ao Notion, buscando a próxima em paralelo.
+
+    Uma tarefa produtora segue a paginação e deposita cada página em uma fila
+    limitada, de modo que a rede trabalha enquanto o consumidor processa a página
+    anterior.
+
+    Args:
+        database_id: ID da base de dados no Notion.
+        filter_conditions: Condições de filtro para a consulta (opcional).
+        logger: Objeto de log para registrar mensagens (opcional).
+        page_size: Número de resultados por página (máximo do Notion: 100).
+
+    Yields:
+        Lista de resultados de cada página, na ordem da consulta.
+
+    Raises:
+        Exception: Qualquer erro da consulta é repassado ao consumidor.
+    """
+    logger.debug(f"Consultando base de dados {database_id}")
+    query_args = {"page_size": page_size}
+    if filter_conditions is not None:
+        query_args["filter"] = filter_conditions
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+    done = object()
+
+    async def produce() -> None:
+        try:
+            while True:
+                response = await query_database(database_id, query_args, logger)
+                await queue.put(response["results"])
+                if not response.get("has_more"):
+                    break
+                # O cursor da próxima página só vem na resposta atual
+                query_args["start_cursor"] = response["next_cursor"]
+            await queue.put(done)
+        except Exception as e:
+            await queue.put(e)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        producer.cancel()
 
 
 async def fetch_notion_data(
-    database_id: str, filter_conditions: Optional[Dict] = None, logger=None
+    database_id: str,
+    filter_conditions: Optional[Dict] = None,
+    logger=None,
+    page_size: int = 100,
 ) -> List[Dict]:
-    """Consulta uma base de dados do Notion com filtro opcional.
+    """Consulta uma base de dados do Notion com filtro opcional, seguindo a paginação.
 
     Args:
         database_id: ID da base de dados no Notion.
         filter_conditions: Condições de filtro para a consulta (opcional).
         logger: Objeto de log para registrar mensagens (opcional).
+        page_size: Número de resultados por página (máximo do Notion: 100).
 
     Returns:
-        Lista de resultados da consulta.
+        Lista com os resultados de todas as páginas da consulta.
     """
-    logger.debug(f"Consultando base de dados {database_id}")
-    if filter_conditions is None:
-        response = await notion.databases.query(database_id)  # Sem filtro
-    else:
-        response = await notion.databases.query(
-            database_id, filter=filter_conditions
-        )  # Com filtro
-    return response["results"]
+    results = []
+    async for page in iterate_notion_pages(
+        database_id, filter_conditions, logger, page_size
+    ):
+        results.extend(page)
+    return results
 
 
-@retry()
 async def get_tasks(
     topics_cache: Dict[str, List[Dict]], logger
 ) -> Tuple[List[Dict], int]:
@@ -122,46 +498,59 @@ async def get_tasks(
     task_ids_seen = set()
     topic_ids_seen = set()
 
-    filter_conditions = {
-        "property": "Status",
-        "formula": {"string": {"does_not_equal": "✅ Concluído"}},
-    }
-    activities = await fetch_notion_data(Config.TASKS_DB_ID, filter_conditions, logger)
+    valid_activities = []
+    # A próxima página é buscada enquanto a atual é processada
+    async for activities in iterate_notion_pages(
+        Config.TASKS_DB_ID, NOT_DONE_FILTER, logger
+    ):
+        for activity in activities:
+            activity_id = activity["id"]
+            if activity_id in task_ids_seen:
+                logger.warning(f"Tarefa duplicada detectada: {activity_id}, pulando")
+                continue
+            task_ids_seen.add(activity_id)
 
-    for activity in activities:
-        activity_id = activity["id"]
-        if activity_id in task_ids_seen:
-            logger.warning(f"Tarefa duplicada detectada: {activity_id}, pulando")
-            continue
-        task_ids_seen.add(activity_id)
+            properties = activity.get("properties", {})
+            name = _title(properties, "Professor")
+            if not name:
+                logger.error(
+                    f"Propriedade 'Professor' ausente ou vazia para tarefa {activity_id}"
+                )
+                continue
 
-        properties = activity.get("properties", {})
-        name = properties.get("Professor", {}).get("title", [{}])[0].get("plain_text")
-        if not name:
-            logger.error(
-                f"Propriedade 'Professor' ausente ou vazia para tarefa {activity_id}"
-            )
-            continue
+            due_date_start = _date_start(properties, "Data de Entrega")
+            if not due_date_start:
+                logger.warning(
+                    f"Data de entrega não definida para tarefa '{name}' ({activity_id}), pulando"
+                )
+                skipped_tasks += 1
+                continue
+            due_date = parse_date(due_date_start, logger)
 
-        due_date_prop = properties.get("Data de Entrega", {}).get("date")
-        if not due_date_prop:
-            logger.warning(
-                f"Data de entrega não definida para tarefa '{name}' ({activity_id}), pulando"
-            )
-            skipped_tasks += 1
-            continue
-        due_date = parse_date(due_date_prop["start"], logger)
+            duration = _number(properties, "Duração")
+            if duration is None:
+                logger.warning(
+                    f"Duração não definida para tarefa '{name}' ({activity_id}), pulando"
+                )
+                skipped_tasks += 1
+                continue
+            duration *= 3600
+            valid_activities.append((activity_id, name, due_date, duration))
 
-        duration = properties.get("Duração", {}).get("number")
-        if duration is None:
-            logger.warning(
-                f"Duração não definida para tarefa '{name}' ({activity_id}), pulando"
-            )
-            skipped_tasks += 1
-            continue
-        duration *= 3600
+    # Uma consulta em lote preenche o cache; a busca por atividade vira consulta ao dicionário
+    await prefetch_topics_for_activities(
+        [activity[0] for activity in valid_activities], topics_cache, logger
+    )
+    topic_lists = await asyncio.gather(
+        *(
+            get_topics_for_activity(activity[0], topics_cache, logger)
+            for activity in valid_activities
+        )
+    )
 
-        topics = await get_topics_for_activity(activity_id, topics_cache, logger)
+    for (activity_id, name, due_date, duration), topics in zip(
+        valid_activities, topic_lists
+    ):
         if not topics:
             tasks.append(
                 {
@@ -181,19 +570,15 @@ async def get_tasks(
                     continue
                 topic_ids_seen.add(topic_id)
 
-                topic_name = (
-                    topic["properties"]
-                    .get("Name", {})
-                    .get("title", [{}])[0]
-                    .get("plain_text")
-                )
+                topic_properties = topic["properties"]
+                topic_name = _title(topic_properties, "Name")
                 if not topic_name:
                     logger.error(
                         f"Propriedade 'Name' ausente ou vazia para tópico {topic_id}"
                     )
                     continue
 
-                topic_duration = topic["properties"].get("Duração", {}).get("number")
+                topic_duration = _number(topic_properties, "Duração")
                 if topic_duration is None:
                     logger.warning(
                         f"Duração não definida para tópico '{topic_name}' ({topic_id}), pulando"
@@ -218,7 +603,48 @@ async def get_tasks(
     return tasks, skipped_tasks
 
 
-@retry()
+async def prefetch_topics_for_activities(
+    activity_ids: List[str], topics_cache: Dict[str, List[Dict]], logger
+) -> None:
+    """Carrega em lote os tópicos das atividades ainda ausentes do cache.
+
+    Uma única consulta paginada traz todos os tópicos não concluídos, que são
+    distribuídos entre as atividades pela relação ATIVIDADES; o número de
+    requisições depende só do número de páginas, não do de atividades.
+
+    Args:
+        activity_ids: IDs das atividades cujos tópicos serão carregados.
+        topics_cache: Cache de tópicos, preenchido com uma lista por atividade.
+        logger: Objeto de log para registrar mensagens.
+    """
+    topics_by_activity: Dict[str, Dict[str, Dict]] = {
+        activity_id: {}
+        for activity_id in activity_ids
+        if activity_id not in topics_cache
+    }
+    if not topics_by_activity:
+        return
+
+    pages = 0
+    async for topics in iterate_notion_pages(
+        Config.TOPICS_DB_ID, NOT_DONE_FILTER, logger
+    ):
+        pages += 1
+        for topic in topics:
+            prop = topic["properties"].get("ATIVIDADES")
+            if not prop or not prop.get("relation"):
+                continue
+            for relation in prop["relation"]:
+                bucket = topics_by_activity.get(relation["id"])
+                if bucket is not None:
+                    bucket[topic["id"]] = topic
+    for activity_id, topics in topics_by_activity.items():
+        topics_cache[activity_id] = list(topics.values())
+    logger.debug(
+        f"Tópicos pré-carregados para {len(topics_by_activity)} atividades em {pages} páginas"
+    )
+
+
 async def get_topics_for_activity(
     activity_id: str, topics_cache: Dict[str, List[Dict]], logger
 ) -> List[Dict]:
@@ -234,16 +660,13 @@ async def get_topics_for_activity(
     """
     if activity_id in topics_cache:
         logger.debug(f"Cache encontrado para tópicos da atividade {activity_id}")
-        cached_topics = topics_cache[activity_id]
-        return list({topic["id"]: topic for topic in cached_topics}.values())
+        # Os tópicos já são deduplicados ao entrar no cache
+        return topics_cache[activity_id]
 
     filter_conditions = {
         "and": [
             {"property": "ATIVIDADES", "relation": {"contains": activity_id}},
-            {
-                "property": "Status",
-                "formula": {"string": {"does_not_equal": "✅ Concluído"}},
-            },
+            NOT_DONE_FILTER,
         ]
     }
     topics = await fetch_notion_data(Config.TOPICS_DB_ID, filter_conditions, logger)
@@ -262,19 +685,15 @@ async def update_time_slot_day(slot_id: str, day_of_week: str, logger) -> None:
         day_of_week: Nome do dia da semana a ser atualizado.
         logger: Objeto de log para registrar mensagens.
     """
-    try:
-        await notion.pages.update(
+    await _call(
+        lambda: notion.pages.update(
             page_id=slot_id,
             properties={"Dia da Semana": {"select": {"name": day_of_week}}},
         )
-        logger.info(
-            f"'Dia da Semana' atualizado para '{day_of_week}' no slot {slot_id}"
-        )
-    except Exception as e:
-        logger.error(f"Erro ao atualizar 'Dia da Semana' para o slot {slot_id}: {e}")
+    )
+    logger.info(f"'Dia da Semana' atualizado para '{day_of_week}' no slot {slot_id}")
 
 
-@retry()
 async def get_time_slots(time_slots_cache: Dict[str, List], logger) -> Tuple[
     List[Tuple[str, datetime.time, datetime.time, Optional[datetime.date]]],
     List[datetime.date],
@@ -288,9 +707,10 @@ async def get_time_slots(time_slots_cache: Dict[str, List], logger) -> Tuple[
     Returns:
         Tupla com lista de slots de tempo e lista de datas excluídas.
     """
-    if time_slots_cache.get("slots"):
+    # Caches gravados sem as datas excluídas são ignorados para não agendar nelas
+    if time_slots_cache.get("slots") and "excluded_dates" in time_slots_cache:
         logger.debug("Usando cache para intervalos de tempo")
-        return time_slots_cache["slots"], []
+        return time_slots_cache["slots"], time_slots_cache["excluded_dates"]
 
     time_slots_data = []
     excluded_dates = []
@@ -301,53 +721,188 @@ async def get_time_slots(time_slots_cache: Dict[str, List], logger) -> Tuple[
     for slot in slots:
         slot_id = slot["id"]
         properties = slot.get("properties", {})
-        exception_date_prop = properties.get("Exceções", {}).get("date")
-        start_time_rich = properties.get("Hora de Início", {}).get("rich_text")
-        end_time_rich = properties.get("Hora de Fim", {}).get("rich_text")
+        exception_start = _date_start(properties, "Exceções")
+        start_time_text = _rich_text(properties, "Hora de Início")
+        end_time_text = _rich_text(properties, "Hora de Fim")
+        day_name = _select_name(properties, "Dia da Semana")
 
-        if exception_date_prop and exception_date_prop["start"]:
+        if exception_start:
             exception_date = datetime.datetime.fromisoformat(
-                exception_date_prop["start"].replace("Z", "")
+                exception_start.replace("Z", "")
             ).date()
-            if not start_time_rich or not end_time_rich:
+            if not start_time_text or not end_time_text:
                 logger.info(
                     f"Exceção em {exception_date} sem horários definida, dia excluído do agendamento"
                 )
                 excluded_dates.append(exception_date)
                 continue
-            day_of_week = exception_date.strftime("%A")
-            day_of_week_portuguese = {
-                v: k.capitalize() for k, v in Config.DAY_MAP.items()
-            }.get(day_of_week)
+            weekday = exception_date.weekday()
+            day_of_week = _WEEKDAY_EN[weekday]
+            day_of_week_portuguese = _WEEKDAY_PT[weekday]
         else:
-            day_prop = properties.get("Dia da Semana", {}).get("select", {})
-            if not day_prop.get("name"):
+            if not day_name:
                 logger.error(
                     f"Propriedade 'Dia da Semana' ausente ou vazia para slot {slot_id}"
                 )
                 continue
-            day_of_week = day_prop["name"]
+            day_of_week = day_name
             exception_date = None
 
-        if not start_time_rich or not end_time_rich:
+        if not start_time_text or not end_time_text:
             logger.error(f"Hora de início ou fim ausente para slot {slot_id}")
             continue
 
-        start_time = datetime.time.fromisoformat(start_time_rich[0]["plain_text"])
-        end_time = datetime.time.fromisoformat(end_time_rich[0]["plain_text"])
+        start_time = datetime.time.fromisoformat(start_time_text)
+        end_time = datetime.time.fromisoformat(end_time_text)
         time_slots_data.append((day_of_week, start_time, end_time, exception_date))
 
-        if exception_date and day_of_week_portuguese:
-            day_prop = properties.get("Dia da Semana", {}).get("select", {})
-            if not day_prop.get("name"):
+        if exception_date and not day_name:
+            # A atualização é só informativa: se falhar após as retentativas, o
+            # slot continua válido para o agendamento
+            try:
                 await update_time_slot_day(slot_id, day_of_week_portuguese, logger)
+            except RETRYABLE_ERRORS as e:
+                logger.error(
+                    f"Erro ao atualizar 'Dia da Semana' para o slot {slot_id}: {e}"
+                )
 
     time_slots_cache["slots"] = time_slots_data
+    time_slots_cache["excluded_dates"] = excluded_dates
     logger.info(f"Intervalos de tempo carregados: {len(time_slots_data)}")
     logger.info(f"Dias excluídos por exceções sem horários: {len(excluded_dates)}")
     return time_slots_data, excluded_dates
 
 
+@lru_cache(maxsize=1024)
+def _entry_title(task_name: str) -> str:
+    """Monta o título curto de uma entrada, memoizado por tarefa.
+
+    Todas as partes de uma tarefa compartilham o mesmo título base, que só
+    varia pelo sufixo com o número da parte.
+
+    Args:
+        task_name: Nome da tarefa ou tópico, possivelmente prefixado por "[Tipo]".
+
+    Returns:
+        Prefixo "[Tipo]" seguido de até 12 caracteres do restante do nome.
+    """
+    # Uma única busca separa o prefixo "[Tipo]" do restante do nome
+    type_end = task_name.find("]") if task_name.startswith("[") else -1
+    task_type = task_name[: type_end + 1]
+    short_name = (
+        task_name[type_end + 1 :].strip() if type_end >= 0 else task_name
+    ) or "Tarefa sem nome"
+    return f"{task_type}{short_name[:12]}"
+
+
+def _entry_name(task_name: str, part_number: Optional[int]) -> str:
+    """Monta o nome de uma entrada, com o número da parte como sufixo.
+
+    Args:
+        task_name: Nome da tarefa ou tópico.
+        part_number: Número da parte, se dividida.
+
+    Returns:
+        Nome da entrada no cronograma.
+    """
+    entry_title = _entry_title(task_name)
+    return f"{entry_title}...{part_number}" if part_number else entry_title
+
+
+def _to_minute(moment: datetime.datetime) -> datetime.datetime:
+    """Reduz um horário ao horário de parede sem fuso, com precisão de minutos.
+
+    O Notion guarda as datas do cronograma em minutos; truncar aqui mantém o
+    valor enviado e a chave de comparação iguais ao que a API devolve.
+
+    Args:
+        moment: Data e hora, com ou sem fuso.
+
+    Returns:
+        Datetime ingênuo sem segundos nem microssegundos.
+    """
+    return moment.replace(tzinfo=None, second=0, microsecond=0)
+
+
+def _wall_clock(date_str: Optional[str]) -> Optional[datetime.datetime]:
+    """Converte uma data retornada pelo Notion em horário de parede local sem fuso.
+
+    Args:
+        date_str: Data em formato ISO, com ou sem offset.
+
+    Returns:
+        Datetime ingênuo no fuso local ou None se a data estiver ausente.
+    """
+    if not date_str:
+        return None
+    moment = datetime.datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(Config.LOCAL_TZ)
+    return _to_minute(moment)
+
+
+def _relation_ids(properties: Dict, key: str) -> Tuple[str, ...]:
+    """Lê os IDs de uma propriedade do tipo relação, em ordem.
+
+    Args:
+        properties: Propriedades da página do Notion.
+        key: Nome da propriedade.
+
+    Returns:
+        Tupla ordenada com os IDs relacionados.
+    """
+    prop = properties.get(key)
+    if not prop or not prop.get("relation"):
+        return ()
+    return tuple(sorted(relation["id"] for relation in prop["relation"]))
+
+
+def _page_entry_key(page: Dict) -> ScheduleKey:
+    """Calcula a chave de uma entrada já existente no cronograma.
+
+    Args:
+        page: Página da base de cronogramas.
+
+    Returns:
+        Nome, início, fim e relações de tópicos e atividades da entrada.
+    """
+    properties = page["properties"]
+    prop = properties.get("Agendamento")
+    date = prop.get("date") if prop else None
+    return (
+        _title(properties, "Name"),
+        _wall_clock(date.get("start")) if date else None,
+        _wall_clock(date.get("end")) if date else None,
+        _relation_ids(properties, "TÓPICOS"),
+        _relation_ids(properties, "ATIVIDADES"),
+    )
+
+
+def _part_entry_key(part: ScheduledPart, name: str) -> ScheduleKey:
+    """Calcula a chave da entrada que `create_schedule_entry` criaria para a parte.
+
+    Args:
+        part: Parte agendada.
+        name: Nome da entrada, já com o número da parte.
+
+    Returns:
+        Nome, início, fim e relações de tópicos e atividades da entrada.
+    """
+    if part.is_topic:
+        topic_ids = (part.task_id,)
+        activity_ids = (part.activity_id,) if part.activity_id else ()
+    else:
+        topic_ids, activity_ids = (), (part.task_id,)
+    return (
+        name,
+        _to_minute(part.start_time),
+        _to_minute(part.end_time),
+        topic_ids,
+        activity_ids,
+    )
+
+
+@retry()
 async def create_schedule_entry(
     task_id: str,
     start_time: datetime.datetime,
@@ -370,30 +925,11 @@ async def create_schedule_entry(
         logger: Objeto de log para registrar mensagens.
         part_number: Número da parte, se dividida.
     """
-    start_time_local = (
-        Config.LOCAL_TZ.localize(start_time)
-        if start_time.tzinfo is None
-        else start_time
-    )
-    end_time_local = (
-        Config.LOCAL_TZ.localize(end_time) if end_time.tzinfo is None else end_time
-    )
-    start_time_no_offset = start_time_local.replace(tzinfo=None).isoformat()
-    end_time_no_offset = end_time_local.replace(tzinfo=None).isoformat()
+    # O fuso vai em "time_zone"; o horário de parede é enviado sem offset
+    start_time_no_offset = _to_minute(start_time).isoformat()
+    end_time_no_offset = _to_minute(end_time).isoformat()
 
-    task_type = (
-        task_name[: task_name.index("]") + 1]
-        if task_name.startswith("[") and "]" in task_name
-        else ""
-    )
-    short_name = (
-        task_name[len(task_type) :].strip() if task_type else task_name
-    ) or "Tarefa sem nome"
-    if len(short_name) > 12:
-        short_name = short_name[:12]
-    name_with_suffix = (
-        f"{task_type}{short_name}{f'...{part_number}' if part_number else ''}"
-    )
+    name_with_suffix = _entry_name(task_name, part_number)
 
     properties = {
         "Name": {"title": [{"type": "text", "text": {"content": name_with_suffix}}]},
@@ -401,7 +937,7 @@ async def create_schedule_entry(
             "date": {
                 "start": start_time_no_offset,
                 "end": end_time_no_offset,
-                "time_zone": Config.LOCAL_TZ.zone,
+                "time_zone": LOCAL_TZ_NAME,
             }
         },
     }
@@ -413,48 +949,86 @@ async def create_schedule_entry(
         properties["ATIVIDADES"] = {"relation": [{"id": task_id}]}
 
     logger.debug(f"Criando entrada no cronograma: {name_with_suffix}")
-    await notion.pages.create(
-        parent={"database_id": Config.SCHEDULES_DB_ID}, properties=properties
+    await _call(
+        lambda: notion.pages.create(parent=SCHEDULES_PARENT, properties=properties)
     )
 
 
-@retry()
-async def create_schedules_in_batches(scheduled_parts: List[Dict], logger) -> int:
-    """Cria entradas no cronograma em lotes.
+async def create_schedules_in_batches(
+    scheduled_parts: List[ScheduledPart],
+    logger,
+    existing_entries: Optional[Dict[ScheduleKey, List[str]]] = None,
+) -> int:
+    """Cria entradas no cronograma com concorrência limitada.
+
+    Em vez de lotes fixos, que esperam a requisição mais lenta de cada lote, todas
+    as entradas são disparadas juntas e o limite global de `_call` mantém uma
+    janela deslizante de requisições em andamento. Uma entrada que falha mesmo
+    após as retentativas é registrada sem interromper as demais.
+
+    Partes idênticas a uma entrada existente (mesmo nome, horário e relações)
+    reaproveitam essa entrada, que é retirada de `existing_entries`; o que sobrar
+    ali é o que `clear_schedules_db` deve arquivar.
 
     Args:
         scheduled_parts: Lista de partes agendadas.
         logger: Objeto de log para registrar mensagens.
+        existing_entries: Entradas atuais do cronograma (opcional).
 
     Returns:
-        Número total de entradas criadas.
+        Número de entradas criadas com sucesso.
+
+    Raises:
+        Exception: Erros que não vêm da API do Notion são repassados.
     """
-    task_part_counters = {}
-    parts_with_numbers = [
-        (part, task_part_counters.setdefault(part["task_id"], 0) + 1)
-        for part in scheduled_parts
-    ]
+    # Numera as partes de cada tarefa em uma única passada
+    task_part_counters = defaultdict(int)
+    parts_with_numbers = []
     for part in scheduled_parts:
-        task_part_counters[part["task_id"]] = (
-            task_part_counters.get(part["task_id"], 0) + 1
-        )
+        task_part_counters[part.task_id] += 1
+        parts_with_numbers.append((part, task_part_counters[part.task_id]))
+
+    reused = 0
+    if existing_entries:
+        parts_to_create = []
+        for part, part_number in parts_with_numbers:
+            key = _part_entry_key(part, _entry_name(part.name, part_number))
+            page_ids = existing_entries.get(key)
+            if page_ids:
+                page_ids.pop()
+                reused += 1
+            else:
+                parts_to_create.append((part, part_number))
+        parts_with_numbers = parts_to_create
+
+    results = await asyncio.gather(
+        *(
+            create_schedule_entry(
+                part.task_id,
+                part.start_time,
+                part.end_time,
+                part.is_topic,
+                part.activity_id,
+                part.name,
+                logger,
+                part_number,
+            )
+            for part, part_number in parts_with_numbers
+        ),
+        return_exceptions=True,
+    )
 
-    for i in range(0, len(parts_with_numbers), Config.SCHEDULE_BATCH_SIZE):
-        batch = parts_with_numbers[i : i + Config.SCHEDULE_BATCH_SIZE]
-        await asyncio.gather(
-            *[
-                create_schedule_entry(
-                    part["task_id"],
-                    part["start_time"],
-                    part["end_time"],
-                    part["is_topic"],
-                    part["activity_id"],
-                    part["name"],
-                    logger,
-                    part_number,
-                )
-                for part, part_number in batch
-            ]
-        )
-        logger.info(f"Lote de {len(batch)} entradas criado")
-    return len(scheduled_parts)
+    failures = 0
+    for (part, _), result in zip(parts_with_numbers, results):
+        if isinstance(result, BaseException):
+            if not isinstance(result, RETRYABLE_ERRORS):
+                raise result
+            failures += 1
+            logger.error(
+                f"Falha ao criar entrada para '{part.name}' em {part.start_time}: {result}"
+            )
+    created = len(parts_with_numbers) - failures
+    logger.info(f"{created} entradas criadas e {reused} reaproveitadas no cronograma")
+    if failures:
+        logger.warning(f"{failures} entradas não puderam ser criadas")
+    return created
@@ -1,6 +1,25 @@
 import datetime
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from operator import itemgetter
 from typing import List, Tuple, Dict, Optional
-from config import Config
+from config import Config, DAY_MAP, DayOfWeek
+
+# Nomes dos dias em inglês indexados por date.weekday()
+_WEEKDAY_EN = tuple(day.value for day in DayOfWeek)
+
+
+@dataclass(slots=True)
+class ScheduledPart:
+    """Parte de uma tarefa alocada em um slot de tempo."""
+
+    task_id: str
+    start_time: datetime.datetime
+    end_time: datetime.datetime
+    is_topic: bool
+    activity_id: Optional[str]
+    name: str
+    due_date: datetime.datetime
 
 
 def generate_available_slots(
@@ -22,10 +41,10 @@ def generate_available_slots(
     Returns:
         Tupla com slots disponíveis, número de dias com exceções e contagem de slots de exceção.
     """
-    excluded_dates = excluded_dates or []
-    current_datetime = datetime.datetime.now(Config.LOCAL_TZ)
+    excluded_dates = set(excluded_dates or ())
+    local_tz = Config.LOCAL_TZ
+    current_datetime = datetime.datetime.now(local_tz)
     current_date = current_datetime.date()
-    end_date = current_date + datetime.timedelta(days=days_to_schedule - 1)
 
     exception_slots_by_day: Dict[
         datetime.date, List[Tuple[datetime.datetime, datetime.datetime]]
@@ -33,18 +52,14 @@ def generate_available_slots(
     regular_slots_by_day: Dict[str, List[Tuple[datetime.time, datetime.time]]] = {}
 
     for day_name, start_time, end_time, exception_date in time_slots_data:
-        day_name_en = Config.DAY_MAP.get(day_name.lower())
+        day_name_en = DAY_MAP.get(day_name.lower())
         if exception_date:
             if exception_date in excluded_dates:
                 continue
             exception_slots_by_day.setdefault(exception_date, []).append(
                 (
-                    Config.LOCAL_TZ.localize(
-                        datetime.datetime.combine(exception_date, start_time)
-                    ),
-                    Config.LOCAL_TZ.localize(
-                        datetime.datetime.combine(exception_date, end_time)
-                    ),
+                    datetime.datetime.combine(exception_date, start_time, local_tz),
+                    datetime.datetime.combine(exception_date, end_time, local_tz),
                 )
             )
         elif day_name_en:
@@ -56,12 +71,13 @@ def generate_available_slots(
     exception_days = set()
     exception_slots_count = 0
 
-    for day in range(days_to_schedule):
-        date = current_date + datetime.timedelta(days=day)
+    first_day = current_date.toordinal()
+    for ordinal in range(first_day, first_day + days_to_schedule):
+        date = datetime.date.fromordinal(ordinal)
         if date in excluded_dates:
             logger.debug(f"Dia {date} excluído do agendamento por exceção sem horários")
             continue
-        day_name_en = date.strftime("%A")
+        day_name_en = _WEEKDAY_EN[date.weekday()]
         if date in exception_slots_by_day:
             exception_days.add(date)
             for start, end in exception_slots_by_day[date]:
@@ -71,33 +87,50 @@ def generate_available_slots(
                 exception_slots_count += 1
         elif day_name_en in regular_slots_by_day:
             for start_time, end_time in regular_slots_by_day[day_name_en]:
-                start = Config.LOCAL_TZ.localize(
-                    datetime.datetime.combine(date, start_time)
-                )
-                end = Config.LOCAL_TZ.localize(
-                    datetime.datetime.combine(date, end_time)
-                )
+                start = datetime.datetime.combine(date, start_time, local_tz)
+                end = datetime.datetime.combine(date, end_time, local_tz)
                 if date == current_date and start <= current_datetime:
                     continue
                 available_slots.append((start, end))
 
-    available_slots.sort(key=lambda x: x[0])
+    available_slots.sort(key=itemgetter(0))
     logger.info(f"Generated {len(available_slots)} available slots")
     return available_slots, len(exception_days), exception_slots_count
 
 
+def _replace_slot(
+    available_slots: List[Tuple[datetime.datetime, datetime.datetime]],
+    index: int,
+    slot: Tuple[datetime.datetime, datetime.datetime],
+) -> None:
+    """Substitui um slot pela sua sobra, mantendo a lista ordenada pelo início.
+
+    Args:
+        available_slots: Lista de slots disponíveis, ordenada pelo início.
+        index: Posição do slot a ser substituído.
+        slot: Sobra do slot (início, fim), que começa depois do original.
+    """
+    next_index = index + 1
+    if next_index == len(available_slots) or slot <= available_slots[next_index]:
+        available_slots[index] = slot
+    else:
+        # Só acontece com slots sobrepostos: reposiciona a sobra
+        del available_slots[index]
+        insort(available_slots, slot)
+
+
 def schedule_part(
     task: Dict,
     available_slots: List[Tuple[datetime.datetime, datetime.datetime]],
     remaining_duration: float,
     due_date_end: datetime.datetime,
     logger,
-) -> Tuple[List[Dict], float, bool, Optional[str]]:
+) -> Tuple[List[ScheduledPart], float, bool, Optional[str]]:
     """Agenda uma parte de uma tarefa em um slot disponível.
 
     Args:
         task: Dicionário com informações da tarefa.
-        available_slots: Lista de slots disponíveis (início, fim).
+        available_slots: Lista de slots disponíveis (início, fim), ordenada pelo início.
         remaining_duration: Duração restante da tarefa em segundos.
         due_date_end: Data e hora limite para agendamento.
         logger: Objeto de log para registrar mensagens.
@@ -109,15 +142,18 @@ def schedule_part(
     REST_DURATION = Config.REST_DURATION_HOURS * 3600
     task_parts = []
     scheduled = False
-    has_specific_time = any(
-        due_date_end.timetuple()[3:6]
-    )  # Verifica se há horário específico
+    # Verifica se há horário específico, sem montar um struct_time por chamada
+    has_specific_time = bool(
+        due_date_end.hour or due_date_end.minute or due_date_end.second
+    )
+    due_date = due_date_end.date()
 
-    for i, (slot_start, slot_end) in enumerate(available_slots):
-        if not has_specific_time and slot_start.date() == due_date_end.date():
+    # Lista ordenada: só os slots antes de 'hi' começam antes do vencimento
+    hi = bisect_left(available_slots, due_date_end, key=itemgetter(0))
+    for i in range(hi):
+        slot_start, slot_end = available_slots[i]
+        if not has_specific_time and slot_start.date() == due_date:
             continue  # Evita agendar no mesmo dia sem horário específico
-        if slot_start >= due_date_end:
-            continue  # Slot começa após o vencimento
         if slot_end > due_date_end:
             slot_end = due_date_end
 
@@ -129,15 +165,15 @@ def schedule_part(
         part_end = slot_start + datetime.timedelta(seconds=part_duration)
 
         task_parts.append(
-            {
-                "task_id": task["id"],
-                "start_time": slot_start,
-                "end_time": part_end,
-                "is_topic": task["is_topic"],
-                "activity_id": task.get("activity_id"),
-                "name": task["name"],
-                "due_date": due_date_end,
-            }
+            ScheduledPart(
+                task_id=task["id"],
+                start_time=slot_start,
+                end_time=part_end,
+                is_topic=task["is_topic"],
+                activity_id=task.get("activity_id"),
+                name=task["name"],
+                due_date=due_date_end,
+            )
         )
         remaining_duration -= part_duration
 
@@ -146,11 +182,11 @@ def schedule_part(
             if remaining_slot_time >= REST_DURATION and remaining_duration > 0:
                 rest_end = part_end + datetime.timedelta(seconds=REST_DURATION)
                 if rest_end < slot_end:
-                    available_slots[i] = (rest_end, slot_end)
+                    _replace_slot(available_slots, i, (rest_end, slot_end))
                 else:
                     del available_slots[i]
             else:
-                available_slots[i] = (part_end, slot_end)
+                _replace_slot(available_slots, i, (part_end, slot_end))
         else:
             del available_slots[i]
 
@@ -163,16 +199,15 @@ def schedule_part(
         current_time = datetime.datetime.now(Config.LOCAL_TZ)
         if not available_slots:
             reason = "Nenhum slot disponível antes do vencimento"
-        elif all(slot[0] >= due_date_end for slot in available_slots):
+        elif hi == 0:
             reason = "Todos os slots disponíveis estão após o vencimento"
         elif not has_specific_time and all(
-            slot[0].date() == due_date_end.date() for slot in available_slots
+            slot[0].date() == due_date for slot in available_slots
         ):
             reason = "Slots disponíveis apenas no mesmo dia do vencimento (sem horário específico)"
         elif all(
             (slot[1] - slot[0]).total_seconds() < remaining_duration
-            for slot in available_slots
-            if slot[0] < due_date_end
+            for slot in available_slots[:hi]
         ):
             reason = "Slots disponíveis têm duração insuficiente"
         elif due_date_end <= current_time:
@@ -188,7 +223,7 @@ def schedule_tasks(
     available_slots: List[Tuple[datetime.datetime, datetime.datetime]],
     logger,
 ) -> Tuple[
-    List[Dict],
+    List[ScheduledPart],
     List[Tuple[datetime.datetime, datetime.datetime]],
     List[Tuple[datetime.datetime, datetime.datetime]],
     List[Dict],
@@ -208,7 +243,7 @@ def schedule_tasks(
     tasks_scheduled = set()
     unscheduled_tasks = []
 
-    for task in sorted(tasks, key=lambda x: x["due_date"]):
+    for task in sorted(tasks, key=itemgetter("due_date")):
         task_id = task["id"]
         if task_id in tasks_scheduled:
             continue
@@ -6,6 +6,39 @@ from typing import Dict, List, Tuple, Any, Optional  # Adicionado Optional aqui
 from config import Config
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson é opcional; o módulo json cobre a ausência
+    orjson = None
+
+
+def json_dumps(data: Any) -> bytes:
+    """Serializa dados em JSON codificado em UTF-8, com orjson quando disponível.
+
+    Args:
+        data: Dados serializáveis em JSON.
+
+    Returns:
+        Conteúdo JSON em bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode("utf-8")
+
+
+def json_loads(content: bytes) -> Any:
+    """Desserializa conteúdo JSON, com orjson quando disponível.
+
+    Args:
+        content: Conteúdo JSON em bytes.
+
+    Returns:
+        Dados desserializados.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
 
 def serialize_time_slots(
     slots: List[Tuple[str, datetime.time, datetime.time, Optional[datetime.date]]]
@@ -56,10 +89,9 @@ def load_cache(
         <= Config.CACHE_MAX_AGE_DAYS
     ):
         try:
-            with file_path.open("r") as f:
-                content = f.read()
-                cache = json.loads(content)
-                cache_hash = hashlib.sha256(content.encode()).hexdigest()
+            content = file_path.read_bytes()
+            cache = json_loads(content)
+            cache_hash = hashlib.sha256(content).hexdigest()
             if cache_name == "time_slots_cache":
                 cache["slots"] = [
                     (
@@ -70,6 +102,11 @@ def load_cache(
                     )
                     for slot in cache["slots"]
                 ]
+                if "excluded_dates" in cache:
+                    cache["excluded_dates"] = [
+                        datetime.date.fromisoformat(date)
+                        for date in cache["excluded_dates"]
+                    ]
             logger.info(
                 f"Cache '{cache_name}' carregado com {len(cache if cache_name == 'topics_cache' else cache['slots'])} itens"
             )
@@ -101,22 +138,24 @@ def save_cache(
 
     try:
         serializable_cache = (
-            {"slots": serialize_time_slots(cache["slots"])}
+            {
+                "slots": serialize_time_slots(cache["slots"]),
+                "excluded_dates": [
+                    date.isoformat() for date in cache.get("excluded_dates", [])
+                ],
+            }
             if cache_name == "time_slots_cache"
             else cache
         )
-        content = json.dumps(serializable_cache)
-        new_hash = hashlib.sha256(content.encode()).hexdigest()
-
-        file_path = Path(file_path)
-        if file_path.exists():
-            _, existing_hash = load_cache(file_path, cache_name, logger)
-            if existing_hash == new_hash:
-                logger.debug(f"Cache '{cache_name}' não mudou, pulando salvamento")
-                return
-
-        with file_path.open("w") as f:
-            json.dump(serializable_cache, f)
+        content = json_dumps(serializable_cache)
+        new_hash = hashlib.sha256(content).hexdigest()
+
+        # Sem hash do carregamento o arquivo falta, expirou ou é inválido: regrava
+        if data_hash == new_hash:
+            logger.debug(f"Cache '{cache_name}' não mudou, pulando salvamento")
+            return
+
+        Path(file_path).write_bytes(content)
         logger.info(
             f"Cache '{cache_name}' salvo com {len(cache if cache_name == 'topics_cache' else cache['slots'])} itens"
         )